@@ -1,33 +1,68 @@
 import json
 import os
-import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from robinhood_trade_event_parser import parse_robinhood_file
 from string_conversions import convert_case, Case
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Not functional: Saving for test purposes if raw data dumps are needed
 
+def find_files(directory, extension):
+    # yield every file path under directory (recursively) whose name ends with extension, ignoring case
+    # a missing directory simply has no files, as with os.walk
+    if not os.path.isdir(directory):
+        return
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # like os.walk, symlinked directories are not descended into
+                if not entry.is_symlink():
+                    yield from find_files(entry.path, extension)
+            elif entry.name.lower().endswith(extension):
+                yield entry.path
+
+
 def parse_raw_data():
     # parse all raw data into ingestible json files
-    for root, dirs, filenames in os.walk('raw_data'):
-        for filename in filenames:
-            if re.search(r'\.txt$', filename, re.IGNORECASE):
-                parse_robinhood_file(os.path.join(root, filename))
+    for filepath in find_files('raw_data', '.txt'):
+        parse_robinhood_file(filepath)
+
+
+def load_json_file(filepath):
+    with open(filepath, 'rb') as data_file:
+        if orjson is not None:
+            return orjson.loads(data_file.read())
+        return json.load(data_file)
+
+
+def execute_trade_events_data(events_data):
+    for trade_event_data in events_data:
+        trade_event = TradeEvent(
+            **{
+                convert_case(key, Case.CAMEL, Case.SNAKE): value
+                for key, value in trade_event_data.items()
+            }
+        )
+        account.execute_trade_event(trade_event)
 
 
 def process_trade_events_data():
     # process all json files in trade events folder
-    for root, dirs, filenames in os.walk('trade_events_data'):
-        for filename in filenames:
-            if re.search(r'\.json$', filename, re.IGNORECASE):
-                with open(os.path.join(root, filename)) as data_file:
-                    events_data = json.load(data_file)
-                    for trade_event_data in events_data:
-                        trade_event = TradeEvent(
-                            **{
-                                convert_case(key, Case.CAMEL, Case.SNAKE): value
-                                for key, value in trade_event_data.items()
-                            }
-                        )
-                        account.execute_trade_event(trade_event)
+    # files are read and decoded in parallel, but events are executed in order since they mutate the account
+    max_workers = 8
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # only max_workers files are loaded ahead, so memory doesn't grow with the size of the folder
+        pending = deque()
+        for filepath in find_files('trade_events_data', '.json'):
+            pending.append(executor.submit(load_json_file, filepath))
+            if len(pending) >= max_workers:
+                execute_trade_events_data(pending.popleft().result())
+        while pending:
+            execute_trade_events_data(pending.popleft().result())
@@ -5,6 +5,7 @@ Convenient methods to transform strings.
 import re
 from datetime import datetime, date
 from enum import IntEnum
+from functools import lru_cache
 
 
 def _convert_snake_to_camel(snake_case_string: str) -> str:
@@ -109,48 +110,58 @@ class Case(IntEnum):
     KEBAB = 4
 
 
+_CASE_CONVERTERS = {
+    Case.SNAKE: {
+        Case.CAMEL: _convert_snake_to_camel,
+        Case.PASCAL: _convert_snake_to_pascal,
+        Case.KEBAB: _convert_snake_to_kebab,
+    },
+    Case.CAMEL: {
+        Case.SNAKE: _convert_camel_to_snake,
+        Case.PASCAL: _convert_camel_to_pascal,
+        Case.KEBAB: _convert_camel_to_kebab,
+    },
+    Case.PASCAL: {
+        Case.SNAKE: _convert_pascal_to_snake,
+        Case.CAMEL: _convert_pascal_to_camel,
+        Case.KEBAB: _convert_pascal_to_kebab,
+    },
+    Case.KEBAB: {
+        Case.SNAKE: _convert_kebab_to_snake,
+        Case.CAMEL: _convert_kebab_to_camel,
+        Case.PASCAL: _convert_kebab_to_pascal,
+    }
+}
+
+
+@lru_cache(maxsize=1024)
 def convert_case(string: str, source_case: Case, target_case: Case) -> str:
     """
-    Convert provided string from source_case to target_case
-    """
-    dispatch = {
-        Case.SNAKE: {
-            Case.CAMEL: _convert_snake_to_camel,
-            Case.PASCAL: _convert_snake_to_pascal,
-            Case.KEBAB: _convert_snake_to_kebab,
-        },
-        Case.CAMEL: {
-            Case.SNAKE: _convert_camel_to_snake,
-            Case.PASCAL: _convert_camel_to_pascal,
-            Case.KEBAB: _convert_camel_to_kebab,
-        },
-        Case.PASCAL: {
-            Case.SNAKE: _convert_pascal_to_snake,
-            Case.CAMEL: _convert_pascal_to_camel,
-            Case.KEBAB: _convert_pascal_to_kebab,
-        },
-        Case.KEBAB: {
-            Case.SNAKE: _convert_kebab_to_snake,
-            Case.CAMEL: _convert_kebab_to_camel,
-            Case.PASCAL: _convert_kebab_to_pascal,
-        }
-    }
-    return dispatch[source_case][target_case](string)
+    Convert provided string from source_case to target_case.
+    Results are cached since the same keys are converted over and over
+    """
+    return _CASE_CONVERTERS[source_case][target_case](string)
+
+
+def _convert_value_keys(value, from_case: Case, to_case: Case):
+    """
+    Convert the keys of any dictionaries within value, which may be a dictionary, list or plain value
+    """
+    if isinstance(value, dict):
+        return convert_keys(value, from_case, to_case)
+    if isinstance(value, list):
+        return [_convert_value_keys(item, from_case, to_case) for item in value]
+    return value
 
 
 def convert_keys(dictionary: dict, from_case: Case, to_case: Case):
-    converted_dict = {}
-    for key, value in dictionary.items():
-        if isinstance(value, dict):
-            value = convert_keys(value, from_case, to_case)
-        if isinstance(value, list):
-            converted_list = []
-            for item in value:
-                converted_list.append(convert_keys(item, from_case, to_case))
-            value = converted_list
-        key = convert_case(key, from_case, to_case)
-        converted_dict[key] = value
-    return converted_dict
+    """
+    Copy of dictionary with its keys, and those of every nested dictionary, converted from from_case to to_case
+    """
+    return {
+        convert_case(key, from_case, to_case): _convert_value_keys(value, from_case, to_case)
+        for key, value in dictionary.items()
+    }
 
 
 def dt_str(dt_object, format_='%Y-%m-%dT%H:%M:%S') -> str:
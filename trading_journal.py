@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
+import atexit
+import bisect
 import json
 import os
 import pickle
+import sys
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
+from functools import lru_cache, reduce
+from math import fsum, gcd, isnan
+from operator import attrgetter
 from typing import List
 import logging
 
@@ -12,39 +20,60 @@ import yfinance
 from dotenv import load_dotenv
 from dateutil import parser
 
-from string_conversions import Case, str_dt, convert_keys
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 load_dotenv('.env')
 
+_EASTERN = pytz.timezone('US/Eastern')
+
 
 def create_report(report: dict):
     filepath = os.path.join('reports', datetime.now().isoformat().replace(':', '-') + '.json')
     logging.info(f'Generating output file {filepath}')
-    with open(filepath, 'w') as output_file:
-        json.dump(convert_keys(report, Case.SNAKE, Case.CAMEL), output_file, indent=2)
+    # the report methods already build camelCase keys, so the dict is written as is
+    if orjson is not None:
+        with open(filepath, 'wb') as output_file:
+            output_file.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filepath, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
 
 
 def utc_to_eastern(dt_string: str) -> datetime:
-    utc_dt = parser.parse(dt_string)
-    eastern_dt = utc_dt.astimezone(pytz.timezone('US/Eastern'))
+    try:
+        utc_dt = datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
+    except ValueError:
+        # fromisoformat only accepts 3 or 6 digit fractional seconds before python 3.11
+        utc_dt = parser.parse(dt_string)
+    eastern_dt = utc_dt.astimezone(_EASTERN)
     return eastern_dt
 
 
+@lru_cache(maxsize=4096)
+def get_expiration_close(expiration_date: date) -> datetime:
+    """
+    Market close (4pm Eastern) on the expiration date
+    """
+    return _EASTERN.localize(datetime(year=expiration_date.year, month=expiration_date.month, day=expiration_date.day, hour=16, minute=0, second=0))
+
+
 def get_robinhood_data():
     logging.info(f'Logging into Robinhood...')
     login = robin_stocks.login(username=os.getenv('TJ_USERNAME'), password=os.getenv('TJ_PASSWORD'))
     logging.debug(login)
     logging.info(f'Fetching options orders...')
-    all_option_orders = reversed(robin_stocks.orders.get_all_option_orders())
+    all_option_orders = list(reversed(robin_stocks.orders.get_all_option_orders()))
     logging.debug(all_option_orders)
+    # instrument requests are network bound, so fetch the ones not cached yet in parallel
+    instrument_cache.prefetch(leg['option'] for order in all_option_orders if order['state'] == 'filled' for leg in order['legs'])
     for order in all_option_orders:
         if order['state'] == 'filled':
             for leg in order['legs']:
                 instrument_data = instrument_cache.get(leg['option'])
-                expiration_date = str_dt(instrument_data['expiration_date'], '%Y-%m-%d').date()
-                option_prices = []
-                for execution in leg['executions']:
-                    option_prices.extend([float(execution['price']) for quantity in range(int(float(execution['quantity'])))])
+                expiration_date = date.fromisoformat(instrument_data['expiration_date'])
                 account.execute_trade_event(
                     TradeEvent(
                         ticker=order['chain_symbol'],
@@ -56,15 +85,17 @@ def get_robinhood_data():
                                 ticker=order['chain_symbol'],
                                 expiration_date=expiration_date,
                                 strike=float(instrument_data['strike_price']),
-                                price=price,
+                                price=float(execution['price']),
                                 is_call=True if instrument_data['type'] == 'call' else False,
                                 is_long=True if leg['side'] == 'buy' else False,
-                            ) for price in option_prices
+                                quantity=int(float(execution['quantity'])),
+                            ) for execution in leg['executions']
                         ]
                     )
                 )
-    all_stock_orders = reversed(robin_stocks.orders.get_all_stock_orders())
+    all_stock_orders = list(reversed(robin_stocks.orders.get_all_stock_orders()))
     logging.debug(all_stock_orders)
+    instrument_cache.prefetch(order['instrument'] for order in all_stock_orders)
     for order in all_stock_orders:
         ticker = instrument_cache.get(order['instrument'])['symbol']
         execution_time = utc_to_eastern(order['last_transaction_at'])
@@ -83,27 +114,34 @@ def get_robinhood_data():
 
 
 def get_open_options(options: List['Option']) -> List['Option']:
-    inventory = {
-        'call': {},
-        'put': {}
-    }
+    """
+    Options left open after netting longs against shorts, ordered as in sort_options
+    """
+    # (is_call, strike): (long options, short options), each oldest first
+    inventory = defaultdict(lambda: (deque(), deque()))
     for option in options:
-        option_type = 'call' if option.is_call else 'put'
-        if inventory[option_type].get(option.strike) is None:
-            inventory[option_type][option.strike] = []
-        counterpart = None
-        for same_strike_option in inventory[option_type][option.strike]:
-            if option.is_long != same_strike_option.is_long:
-                counterpart = same_strike_option
-                break
-        if counterpart is not None:
-            inventory[option_type][option.strike].remove(counterpart)
+        long_options, short_options = inventory[(option.is_call, option.strike)]
+        if option.is_long:
+            same_side, opposite_side = long_options, short_options
         else:
-            inventory[option_type][option.strike].append(option)
+            same_side, opposite_side = short_options, long_options
+        quantity = option.quantity
+        # close the oldest opposite options first (FIFO)
+        while quantity and opposite_side:
+            counterpart = opposite_side[0]
+            if counterpart.quantity > quantity:
+                opposite_side[0] = counterpart.with_quantity(counterpart.quantity - quantity)
+                quantity = 0
+            else:
+                quantity -= counterpart.quantity
+                opposite_side.popleft()
+        if quantity:
+            same_side.append(option if quantity == option.quantity else option.with_quantity(quantity))
     open_options = []
-    for strikes in inventory.values():
-        for strike_options in strikes.values():
-            open_options.extend(strike_options)
+    for key in sorted(inventory):
+        long_options, short_options = inventory[key]
+        open_options.extend(long_options)
+        open_options.extend(short_options)
     return open_options
 
 
@@ -134,9 +172,7 @@ def get_open_options(options: List['Option']) -> List['Option']:
 
 
 def sort_options(options: List['Option']) -> List['Option']:
-    sorted_options = sorted(options, key=lambda option: option.strike)
-    sorted_options.sort(key=lambda option: option.is_call)
-    return sorted_options
+    return sorted(options, key=attrgetter('is_call', 'strike'))
 
 
 class Cache:
@@ -147,12 +183,14 @@ class Cache:
         :param filepath: string
         """
         self.filepath = filepath
+        self._dirty = False
         if filepath:
             try:
                 with open(filepath, 'rb') as file:
                     self.cache = pickle.load(file)
             except (FileNotFoundError, pickle.UnpicklingError):
                 self.cache = {}
+            atexit.register(self.save)
         else:
             self.cache = {}
 
@@ -160,12 +198,14 @@ class Cache:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.save()
+        # saved once on program close (see __init__); call save() to persist earlier
+        pass
 
     def save(self):
-        if self.filepath:
+        if self.filepath and self._dirty:
             with open(self.filepath, 'wb') as file:
                 pickle.dump(self.cache, file)
+            self._dirty = False
 
     def get(self, item):
         obj = self.cache.get(item)
@@ -173,8 +213,22 @@ class Cache:
             logging.debug(f'item {item} found in {self.__class__.__name__}')
             return obj
         self.cache[item] = self._get(item)
+        self._dirty = True
         return self.cache[item]
 
+    def prefetch(self, items, max_workers=16):
+        """
+        Fetch every uncached item concurrently so later get() calls are served from the cache
+        """
+        missing = [item for item in dict.fromkeys(items) if self.cache.get(item) is None]
+        if not missing:
+            return
+        logging.info(f'Prefetching {len(missing)} items for {self.__class__.__name__}...')
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for item, obj in zip(missing, executor.map(self._get, missing)):
+                self.cache[item] = obj
+        self._dirty = True
+
     def _get(self, item):
         raise NotImplementedError
 
@@ -208,6 +262,32 @@ class ClosingPriceCache(Cache):
             closing_price = closing_price.array[0]
         return closing_price
 
+    def prefetch(self, items):
+        """
+        Download the closing prices of every uncached item in a single request
+        :param items: iterable of tuple(ticker: str, expiration_date: date)
+        """
+        missing = [item for item in dict.fromkeys(items) if self.cache.get(item) is None]
+        if not missing:
+            return
+        tickers = sorted({ticker for ticker, _ in missing})
+        start = min(expiration_date for _, expiration_date in missing)
+        end = max(expiration_date for _, expiration_date in missing) + timedelta(days=1)
+        logging.info(f'Fetching closing prices of {len(tickers)} tickers from {start} to {end}...')
+        prices = yfinance.download(tickers, start=start.isoformat(), end=end.isoformat(), group_by='ticker', threads=True, progress=False)
+        for ticker, expiration_date in missing:
+            try:
+                ticker_prices = prices[ticker] if prices.columns.nlevels > 1 else prices
+                closing_price = ticker_prices['Close'][expiration_date.isoformat()]
+                if hasattr(closing_price, 'array'):
+                    closing_price = closing_price.array[0]
+            except (KeyError, IndexError):
+                continue  # left for get() to fetch on its own
+            if isnan(closing_price):
+                continue
+            self.cache[(ticker, expiration_date)] = closing_price
+            self._dirty = True
+
 
 class TickerEventCache(Cache):
     def __init__(self):
@@ -219,9 +299,27 @@ class TickerEventCache(Cache):
     def _get(self, item):
         """
         :param item: ticker: str
-        :return: list of robinhood events related to ticker
+        :return: dict of option instrument url: confirmed exercise/assignment events of that option, oldest first
         """
-        return robin_stocks.get_events(item)
+        events_by_option = {}
+        for event in robin_stocks.get_events(item):
+            if event['state'] == 'confirmed' and event['type'] in ('assignment', 'exercise'):
+                events_by_option.setdefault(event['option'], []).append(event)
+        # partial exercises/assignments are applied in the order they happened
+        for option_events in events_by_option.values():
+            option_events.sort(key=lambda event: utc_to_eastern(event['created_at']))
+        return events_by_option
+
+
+TradeAggregate = namedtuple('TradeAggregate', [
+    'total_option_premium_profit',
+    'option_premium_profit_by_ticker',
+    'total_trade_profit',
+    'trade_profit_by_ticker',
+    'average_trade_profit',
+    'win_percent',
+    'average_trade_duration',
+])
 
 
 class Account:
@@ -243,10 +341,10 @@ class Account:
         return round(self.total_deposited - self.total_withdrawn, 2)
 
     def execute_trade_event(self, trade_event: 'TradeEvent'):
-        trade = self.trades.get((trade_event.ticker, trade_event.expiration_date))
+        trade_key = (trade_event.ticker, trade_event.expiration_date)
+        trade = self.trades.get(trade_key)
         if trade is None:
-            trade = Trade(trade_event.ticker, trade_event.expiration_date, self)
-            self.trades[(trade_event.ticker, trade_event.expiration_date)] = trade
+            trade = self.trades[trade_key] = Trade(trade_event.ticker, trade_event.expiration_date, self)
         trade.add_event(trade_event)
 
     def report(self):
@@ -256,98 +354,96 @@ class Account:
         all_trades = list(self.trades.values())
         all_trades.sort(key=lambda trade: trade.expiration_date, reverse=True)
         strategy_count_by_name = {}
+        closing_price_cache.prefetch((trade.ticker, trade.expiration_date) for trade in all_trades if trade.is_expired)
         for trade in all_trades:
             trade.resolve_events()
             trade.resolve_expired_options()
-        closed_trades = list(filter(lambda trade: trade.is_closed, all_trades))
+        closed_trades = []
+        open_trades = []
+        for trade in all_trades:
+            (closed_trades if trade.is_closed else open_trades).append(trade)
         for trade in closed_trades:
             for event in trade.trade_events:
                 if event.duration > timedelta(minutes=5) and event.strategy.name != 'Close Position':
                     strategy_count_by_name.setdefault(event.strategy.name, 0)
                     strategy_count_by_name[event.strategy.name] += 1
-            # sort strategy dictionary by popularity (highest value descending)
-            strategy_count_by_name = {key: strategy_count_by_name[key] for key in sorted(strategy_count_by_name, key=strategy_count_by_name.get, reverse=True)}
-        open_trades = [trade for trade in all_trades if trade not in closed_trades]
-        max_profit_of_open_trades = round(sum([trade.strategies[-1].max_profit for trade in open_trades]), 2) # all premium collected thus far on the trade
-        open_collateral = round(sum([trade.strategies[-1].collateral for trade in open_trades]), 2) # collateral required for last strategy in open trade
-        total_realized_profit = self.get_total_option_premium_profit(closed_trades) + self.get_total_share_profit()
+        # sort strategy dictionary by popularity (highest value descending)
+        strategy_count_by_name = {key: strategy_count_by_name[key] for key in sorted(strategy_count_by_name, key=strategy_count_by_name.get, reverse=True)}
+        max_profit_of_open_trades = round(sum(trade.trade_events[-1].strategy.max_profit for trade in open_trades), 2) # all premium collected thus far on the trade
+        open_collateral = round(sum(trade.trade_events[-1].strategy.collateral for trade in open_trades), 2) # collateral required for last strategy in open trade
+        closed_aggregate = self._aggregate(closed_trades)
+        total_realized_profit = closed_aggregate.total_option_premium_profit + self.get_total_share_profit()
         calculated_cash_after_profit = round(self.calculated_cash + total_realized_profit + max_profit_of_open_trades - open_collateral, 2)
+        if calculated_cash_after_profit == float('inf'):
+            calculated_cash_after_profit = 'inf'
         # cash_slippage = round(self.portfolio_cash - calculated_cash_after_profit, 2)
         stats = {
-            'total_realized_profit': total_realized_profit,
-            'total_cash_deposited': self.total_deposited,
-            'total_cash_withdrawn': self.total_withdrawn,
-            'calculated_collateral_held': open_collateral,
-            'calculated_cash_after_profit': calculated_cash_after_profit,
-            'reported_portfolio_cash': self.portfolio_cash,
-            'reported_cash_held_for_collateral': self.cash_held_for_collateral,
-            'reported_buying_power': self.buying_power,
-            'reported_cash': self.cash,
-            'unsettled_funds': self.unsettled_funds,
-            'unsettled_debit': self.unsettled_debit,
-            'total_share_profit': self.get_total_share_profit(),
-            'share_profit_by_ticker': self.get_share_profit_by_ticker(),
-            'closed_shares': {
+            'totalRealizedProfit': total_realized_profit,
+            'totalCashDeposited': self.total_deposited,
+            'totalCashWithdrawn': self.total_withdrawn,
+            'calculatedCollateralHeld': open_collateral,
+            'calculatedCashAfterProfit': calculated_cash_after_profit,
+            'reportedPortfolioCash': self.portfolio_cash,
+            'reportedCashHeldForCollateral': self.cash_held_for_collateral,
+            'reportedBuyingPower': self.buying_power,
+            'reportedCash': self.cash,
+            'unsettledFunds': self.unsettled_funds,
+            'unsettledDebit': self.unsettled_debit,
+            'totalShareProfit': self.get_total_share_profit(),
+            'shareProfitByTicker': self.get_share_profit_by_ticker(),
+            'closedShares': {
                 ticker: len(shares) for ticker, shares in self.closed_shares.items()
             },
-            'open_shares': {
+            'openShares': {
                 ticker: len(shares) * (1 if shares and shares[0].is_long else -1) for ticker, shares in self.open_shares.items()
             },
-            'total_option_premium_profit': self.get_total_option_premium_profit(closed_trades),
-            'option_premium_profit_by_ticker': self.get_option_premium_profit_by_ticker(closed_trades),
-            'total_trade_profit': self.get_total_trade_profit(closed_trades),
-            'average_trade_profit': self.get_average_trade_profit(closed_trades),
-            'trade_profit_by_ticker': self.get_trade_profit_by_ticker(closed_trades),
-            'total_trade_count': len(all_trades),
-            'trade_count_by_ticker': self.get_trade_count_by_ticker(all_trades),
-            'win_percent': self.get_win_percent(closed_trades),
-            'average_trade_duration': str(self.get_average_trade_duration(closed_trades)),
-            'strategy_count_by_name': strategy_count_by_name,
-            'closed_trades': [trade.report() for trade in closed_trades],
-            'open_trades': [trade.report() for trade in open_trades],
+            'totalOptionPremiumProfit': closed_aggregate.total_option_premium_profit,
+            'optionPremiumProfitByTicker': closed_aggregate.option_premium_profit_by_ticker,
+            'totalTradeProfit': closed_aggregate.total_trade_profit,
+            'averageTradeProfit': closed_aggregate.average_trade_profit,
+            'tradeProfitByTicker': closed_aggregate.trade_profit_by_ticker,
+            'totalTradeCount': len(all_trades),
+            'tradeCountByTicker': self.get_trade_count_by_ticker(all_trades),
+            'winPercent': closed_aggregate.win_percent,
+            'averageTradeDuration': str(closed_aggregate.average_trade_duration),
+            'strategyCountByName': strategy_count_by_name,
+            'closedTrades': [trade.report() for trade in closed_trades],
+            'openTrades': [trade.report() for trade in open_trades],
         }
         create_report(stats)
 
-    def get_total_option_premium_profit(self, trades=None) -> float:
-        if trades is None:
-            trades = self.trades.values()
-        return round(sum(trade.premium_profit for trade in trades), 2)
-
-    def get_option_premium_profit_by_ticker(self, trades=None) -> dict:
-        profits_by_ticker = {}
-        for trade in trades:
-            profits_by_ticker.setdefault(trade.ticker, 0)
-            profits_by_ticker[trade.ticker] += trade.premium_profit
-        return profits_by_ticker
-
-    def get_total_trade_profit(self, trades=None) -> float:
-        if trades is None:
-            trades = self.trades.values()
-        return round(sum(trade.net_profit for trade in trades), 2)
-
-    def get_trade_profit_by_ticker(self, trades=None) -> dict:
-        profits_by_ticker = {}
+    def _aggregate(self, trades) -> 'TradeAggregate':
+        """
+        Gather every per-trade statistic of the report in a single pass over trades
+        """
+        total_option_premium_profit = 0
+        option_premium_profit_by_ticker = {}
+        total_trade_profit = 0
+        trade_profit_by_ticker = {}
+        wins = 0
+        total_duration = timedelta(0)
         for trade in trades:
-            profits_by_ticker.setdefault(trade.ticker, 0)
-            profits_by_ticker[trade.ticker] += trade.net_profit
-        return profits_by_ticker
-
-    def get_average_trade_profit(self, trades=None) -> float:
-        if trades is None:
-            trades = self.trades.values()
-        return round(self.get_total_trade_profit(trades) / len(trades), 2)
-
-    def get_win_percent(self, trades=None) -> float:
-        if trades is None:
-            trades = self.trades.values()
-        wins = [True for trade in trades if trade.is_win]
-        return round(len(wins) / len(trades) * 100, 2)
-
-    def get_average_trade_duration(self, trades=None) -> timedelta:
-        if trades is None:
-            trades = self.trades.values()
-        total_duration = sum([trade.duration for trade in trades], timedelta(0))
-        return total_duration / len(trades)
+            premium_profit = trade.premium_profit
+            net_profit = trade.net_profit
+            total_option_premium_profit += premium_profit
+            option_premium_profit_by_ticker.setdefault(trade.ticker, 0)
+            option_premium_profit_by_ticker[trade.ticker] += premium_profit
+            total_trade_profit += net_profit
+            trade_profit_by_ticker.setdefault(trade.ticker, 0)
+            trade_profit_by_ticker[trade.ticker] += net_profit
+            if trade.is_win:
+                wins += 1
+            total_duration += trade.duration
+        total_trade_profit = round(total_trade_profit, 2)
+        return TradeAggregate(
+            total_option_premium_profit=round(total_option_premium_profit, 2),
+            option_premium_profit_by_ticker=option_premium_profit_by_ticker,
+            total_trade_profit=total_trade_profit,
+            trade_profit_by_ticker=trade_profit_by_ticker,
+            average_trade_profit=round(total_trade_profit / len(trades), 2),
+            win_percent=round(wins / len(trades) * 100, 2),
+            average_trade_duration=total_duration / len(trades),
+        )
 
     def get_trade_count_by_ticker(self, trades=None) -> dict:
         trades_by_ticker = {}
@@ -431,6 +527,8 @@ class Account:
 
 
 class Option:
+    __slots__ = ('id', 'ticker', 'strike', 'price', 'is_call', 'is_long', 'expiration_date', 'quantity')
+
     def __init__(
             self,
             id_: str,
@@ -440,6 +538,7 @@ class Option:
             is_call: bool,
             is_long: bool,
             expiration_date: date,
+            quantity: int = 1,
             **kwargs
     ):
         self.id = id_
@@ -449,33 +548,55 @@ class Option:
         self.is_call = is_call
         self.is_long = is_long
         self.expiration_date = expiration_date
+        self.quantity = quantity
         logging.info(f'Adding option {self}')
 
     def __repr__(self):
         return self.__str__()
 
     def __str__(self):
-        return f'<Option {self.ticker} {"+" if self.is_long else "-"}{self.strike}{"c" if self.is_call else "p"} {self.expiration_date}>'
+        return f'<Option {self.ticker} {"+" if self.is_long else "-"}{self.quantity}x{self.strike}{"c" if self.is_call else "p"} {self.expiration_date}>'
 
     def report(self):
         return {
-            'is_call': self.is_call,
-            'is_long': self.is_long,
+            'isCall': self.is_call,
+            'isLong': self.is_long,
             'strike': self.strike,
             'price': self.price,
+            'quantity': self.quantity,
         }
 
+    def with_quantity(self, quantity: int) -> 'Option':
+        """
+        Copy of this option representing a different number of contracts
+        """
+        option = Option.__new__(Option)
+        # copies every slot, so new fields only need adding to __slots__ and __init__
+        for field in self.__slots__:
+            setattr(option, field, getattr(self, field))
+        option.quantity = quantity
+        return option
+
+    @classmethod
+    def closing_of(cls, option: 'Option', price: float = 0.0, quantity: int = None) -> 'Option':
+        """
+        Opposite side of option, used to close it out at price
+        :param quantity: contracts to close, all of option's contracts if None
+        """
+        closing_option = option.with_quantity(option.quantity if quantity is None else quantity)
+        closing_option.is_long = not option.is_long
+        closing_option.price = price
+        return closing_option
+
     def get_profit_at(self, underlying_price: float) -> float:
-        if self.is_call:
-            if self.is_long:
-                return max((underlying_price * 100) - (self.strike * 100), 0) - (self.price * 100)
-            return min((self.strike * 100 - underlying_price * 100), 0) + self.price * 100
-        if self.is_long:
-            return max((self.strike * 100) - (underlying_price * 100), 0) - (self.price * 100)
-        return min((underlying_price * 100) - (self.strike * 100), 0) + self.price * 100
+        # a short's payoff is the long payoff with the sign flipped
+        call_sign = 1 if self.is_call else -1
+        long_sign = 1 if self.is_long else -1
+        intrinsic_value = max(call_sign * (underlying_price * 100 - self.strike * 100), 0)
+        return long_sign * (intrinsic_value - self.price * 100) * self.quantity
 
     def get_collateral(self):
-        return self.strike * 100
+        return self.strike * 100 * self.quantity
 
 
 class Share:
@@ -532,14 +653,82 @@ class ShareRepository:
         self.profit = 0.0
 
 
+# legs of a strategy, as (is_call, is_long)
+LONG_CALL = (True, True)
+SHORT_CALL = (True, False)
+LONG_PUT = (False, True)
+SHORT_PUT = (False, False)
+
+# (legs ordered as in sort_options, get_strike_pattern of their strikes): strategy name
+STRATEGY_NAMES = {
+    ((LONG_CALL,), ()): 'Long Call',
+    ((SHORT_CALL,), ()): 'Short Call',
+    ((LONG_PUT,), ()): 'Long Put',
+    ((SHORT_PUT,), ()): 'Short Put',
+    ((LONG_CALL, SHORT_CALL), (1,)): 'Long Call Spread',
+    ((SHORT_CALL, LONG_CALL), (1,)): 'Short Call Spread',
+    ((LONG_PUT, SHORT_PUT), (1,)): 'Short Put Spread',
+    ((SHORT_PUT, LONG_PUT), (1,)): 'Long Put Spread',
+    ((LONG_PUT, SHORT_CALL), (1,)): 'Collar',
+    ((LONG_PUT, SHORT_CALL), (0,)): 'Long Straddle',
+    ((LONG_PUT, SHORT_CALL), (-1,)): 'Long Strangle',
+    ((SHORT_PUT, LONG_CALL), (1,)): 'Long Strangle',
+    ((SHORT_PUT, LONG_CALL), (0,)): 'Short Combination',
+    ((SHORT_PUT, LONG_CALL), (-1,)): 'Long Strangle',
+    ((LONG_PUT, LONG_CALL), (1,)): 'Long Strangle',
+    ((LONG_PUT, LONG_CALL), (0,)): 'Long Straddle',
+    ((LONG_PUT, LONG_CALL), (-1,)): 'Long Strangle',
+    ((SHORT_PUT, SHORT_CALL), (1,)): 'Short Strangle',
+    ((SHORT_PUT, SHORT_CALL), (0,)): 'Short Straddle',
+    ((SHORT_PUT, SHORT_CALL), (-1,)): 'Short Strangle',
+    ((SHORT_CALL, LONG_CALL, LONG_CALL), (False, True)): 'Call Back Spread',
+    ((LONG_CALL, SHORT_CALL, SHORT_CALL), (False, True)): 'Call Front Spread',
+    ((LONG_PUT, LONG_PUT, SHORT_PUT), (True, False)): 'Put Back Spread',
+    ((SHORT_PUT, SHORT_PUT, LONG_PUT), (True, False)): 'Put Front Spread',
+    ((SHORT_PUT, SHORT_CALL, LONG_CALL), (True, False)): 'Short Big Lizard',
+    ((SHORT_PUT, SHORT_CALL, LONG_CALL), (False, False)): 'Short Jade Lizard',
+    ((LONG_PUT, LONG_CALL, SHORT_CALL), (True, False)): 'Long Big Lizard',
+    ((LONG_PUT, LONG_CALL, SHORT_CALL), (False, False)): 'Long Jade Lizard',
+    ((LONG_PUT, SHORT_PUT, SHORT_CALL, LONG_CALL), (True, True)): 'Short Iron Butterfly',
+    ((LONG_PUT, SHORT_PUT, SHORT_CALL, LONG_CALL), (True, False)): 'Short Iron Condor',
+    ((SHORT_PUT, LONG_PUT, LONG_CALL, SHORT_CALL), (True, True)): 'Long Iron Butterfly',
+    ((SHORT_PUT, LONG_PUT, LONG_CALL, SHORT_CALL), (True, False)): 'Long Iron Condor',
+    ((LONG_CALL, SHORT_CALL, SHORT_CALL, LONG_CALL), (True, True)): 'Long Call Butterfly',
+    ((LONG_CALL, SHORT_CALL, SHORT_CALL, LONG_CALL), (True, False)): 'Long Call Condor',
+    ((SHORT_CALL, LONG_CALL, LONG_CALL, SHORT_CALL), (True, True)): 'Short Call Butterfly',
+    ((SHORT_CALL, LONG_CALL, LONG_CALL, SHORT_CALL), (True, False)): 'Short Call Condor',
+    ((LONG_PUT, SHORT_PUT, SHORT_PUT, LONG_PUT), (True, True)): 'Long Put Butterfly',
+    ((LONG_PUT, SHORT_PUT, SHORT_PUT, LONG_PUT), (True, False)): 'Long Put Condor',
+    ((SHORT_PUT, LONG_PUT, LONG_PUT, SHORT_PUT), (True, True)): 'Short Put Butterfly',
+    ((SHORT_PUT, LONG_PUT, LONG_PUT, SHORT_PUT), (True, False)): 'Short Put Condor',
+}
+
+
+def get_strike_pattern(strikes: List[float]) -> tuple:
+    """
+    Relations between strikes (ordered as in sort_options) that distinguish strategies with the same legs:
+    2 legs: direction of the second strike from the first (1, 0 or -1)
+    3 legs: whether the first two strikes are equal, whether the last two strikes are equal
+    4 legs: whether both wings are equally wide, whether the middle strikes are equal
+    """
+    if len(strikes) == 2:
+        return ((strikes[1] > strikes[0]) - (strikes[1] < strikes[0]),)
+    if len(strikes) == 3:
+        return (strikes[0] == strikes[1], strikes[1] == strikes[2])
+    if len(strikes) == 4:
+        return (strikes[1] - strikes[0] == strikes[3] - strikes[2], strikes[1] == strikes[2])
+    return ()
+
+
 class Strategy:
     def __init__(
             self,
             trade_event: 'TradeEvent',
             options: List['Option'],
+            pre_sorted: bool = False,
     ):
         self.trade_event = trade_event
-        self.options = sort_options(options)
+        self.options = options if pre_sorted else sort_options(options)
         self.name = f'{len(self.options)}-Option Strategy'
         self.max_profit = float('nan')
         self.max_loss = float('nan')
@@ -553,208 +742,66 @@ class Strategy:
         self._get_profit_loss()
         self._get_collateral()
 
+    def _get_unit_options(self) -> List['Option']:
+        """
+        One option per contract of the smallest whole ratio of this strategy's legs,
+        so a 5-lot spread is named the same as a 1-lot spread
+        """
+        quantities = {}
+        leg_options = {}
+        for option in self.options:
+            key = (option.is_call, option.strike, option.is_long)
+            quantities[key] = quantities.get(key, 0) + option.quantity
+            leg_options.setdefault(key, option)
+        if len(quantities) == len(self.options) and all(quantity == 1 for quantity in quantities.values()):
+            return self.options
+        divisor = reduce(gcd, quantities.values())
+        unit_options = []
+        for key, option in leg_options.items():
+            unit_options.extend([option] * (quantities[key] // divisor))
+        return unit_options
+
     def _get_name(self):
-        options = self.options
-        if len(options) == 1:
-            if options[0].is_long:
-                if options[0].is_call:
-                    self.name = 'Long Call'
-                else:
-                    self.name = 'Long Put'
-            else:
-                if options[0].is_call:
-                    self.name = 'Short Call'
-                else:
-                    self.name = 'Short Put'
-        if len(options) == 2:
-            if all([option.is_call for option in options]):
-                if options[0].is_long and not options[1].is_long:
-                    self.name = 'Long Call Spread'
-                if not options[0].is_long and options[1].is_long:
-                    self.name = 'Short Call Spread'
-            elif all([not option.is_call for option in options]):
-                if options[0].is_long and not options[1].is_long:
-                    self.name = 'Short Put Spread'
-                if not options[0].is_long and options[1].is_long:
-                    self.name = 'Long Put Spread'
-            else:
-                if all([
-                    not options[0].is_call,
-                    options[0].is_long,
-                    options[1].is_call,
-                    not options[1].is_long,
-                    options[1].strike > options[0].strike,
-                ]):
-                    self.name = 'Collar'
-                elif all([
-                    options[0].is_call,
-                    options[0].is_long,
-                    not options[1].is_call,
-                    not options[1].is_long,
-                    options[1].strike == options[0].strike,
-                ]):
-                    self.name = 'Long Combination'
-                elif all([
-                    not options[0].is_call,
-                    not options[0].is_long,
-                    options[1].is_call,
-                    options[1].is_long,
-                    options[1].strike == options[0].strike,
-                ]):
-                    self.name = 'Short Combination'
-                else:
-                    position = 'Long'
-                    if not options[0].is_long and not options[1].is_long:
-                        position = 'Short'
-                    if options[0].strike == options[1].strike:
-                        spread_type = 'Straddle'
-                    else:
-                        spread_type = 'Strangle'
-                    self.name = f'{position} {spread_type}'
-        if len(options) == 3:
-            if all([option.is_call for option in options]):
-                if all([
-                    not options[0].is_long,
-                    options[1].is_long,
-                    options[2].is_long,
-                    options[1].strike == options[2].strike,
-                ]):
-                    self.name = 'Call Back Spread'
-                elif all([
-                    options[0].is_long,
-                    not options[1].is_long,
-                    not options[2].is_long,
-                    options[1].strike == options[2].strike,
-                ]):
-                    self.name = 'Call Front Spread'
-            elif all([not option.is_call for option in options]):
-                if all([
-                    options[0].is_long,
-                    options[1].is_long,
-                    not options[2].is_long,
-                    options[0].strike == options[1].strike
-                ]):
-                    self.name = 'Put Back Spread'
-                elif all([
-                    not options[0].is_long,
-                    not options[1].is_long,
-                    options[2].is_long,
-                    options[0].strike == options[1].strike,
-                ]):
-                    self.name = 'Put Front Spread'
-            else:
-                if all([
-                    not options[0].is_call,
-                    options[1].is_call,
-                    options[2].is_call,
-                ]):
-                    if all([
-                        not options[0].is_long,
-                        not options[1].is_long,
-                        options[2].is_long,
-                    ]):
-                        if options[0].strike == options[1].strike:
-                            self.name = 'Short Big Lizard'
-                        else:
-                            self.name = 'Short Jade Lizard'
-                    elif all([
-                        options[0].is_long,
-                        options[1].is_long,
-                        not options[2].is_long,
-                    ]):
-                        if options[0].strike == options[1].strike:
-                            self.name = 'Long Big Lizard'
-                        else:
-                            self.name = 'Long Jade Lizard'
-        if len(options) == 4:
-            if options[1].strike - options[0].strike == options[3].strike - options[2].strike:
-                if all([
-                    not options[0].is_call,
-                    not options[1].is_call,
-                    options[2].is_call,
-                    options[3].is_call,
-                ]):
-                    if options[1].strike == options[2].strike:
-                        spread_type = 'Iron Butterfly'
-                    else:
-                        spread_type = 'Iron Condor'
-                    if all([
-                        options[0].is_long,
-                        not options[1].is_long,
-                        not options[2].is_long,
-                        options[3].is_long,
-                    ]):
-                        self.name = f'Short {spread_type}'
-                    elif all([
-                        not options[0].is_long,
-                        options[1].is_long,
-                        options[2].is_long,
-                        not options[3].is_long,
-                    ]):
-                        self.name = f'Long {spread_type}'
-                elif all([option.is_call for option in options]):
-                    if all([
-                        options[0].is_long,
-                        not options[1].is_long,
-                        not options[2].is_long,
-                        options[3].is_long,
-                    ]):
-                        if options[1].strike == options[2].strike:
-                            self.name = f'Long Call Butterfly'
-                        else:
-                            self.name = 'Long Call Condor'
-                    elif all([
-                        not options[0].is_long,
-                        options[1].is_long,
-                        options[2].is_long,
-                        not options[3].is_long,
-                    ]):
-                        if options[1].strike == options[2].strike:
-                            self.name = 'Short Call Butterfly'
-                        else:
-                            self.name = 'Short Call Condor'
-                elif all([not option.is_call for option in options]):
-                    if all([
-                        options[0].is_long,
-                        not options[1].is_long,
-                        not options[2].is_long,
-                        options[3].is_long,
-                    ]):
-                        if options[1].strike == options[2].strike:
-                            self.name = f'Long Put Butterfly'
-                        else:
-                            self.name = 'Long Put Condor'
-                    elif all([
-                        not options[0].is_long,
-                        options[1].is_long,
-                        options[2].is_long,
-                        not options[3].is_long,
-                    ]):
-                        if options[1].strike == options[2].strike:
-                            self.name = 'Short Put Butterfly'
-                        else:
-                            self.name = 'Short Put Condor'
+        options = self._get_unit_options()
+        legs = tuple((option.is_call, option.is_long) for option in options)
+        strike_pattern = get_strike_pattern([option.strike for option in options])
+        self.name = STRATEGY_NAMES.get((legs, strike_pattern), f'{len(options)}-Option Strategy')
 
     def _get_profit_loss(self):
-        price_points = [min(self.options[0].strike - 1, 0), *[option.strike for option in self.options], self.options[-1].strike + 1]
+        options = self.options
+        price_points = [min(options[0].strike - 1, 0), *[option.strike for option in options], options[-1].strike + 1]
+        # Option.get_profit_at with each leg's constants computed once; strategies have a handful of legs,
+        # so this is faster in plain python than building arrays
+        legs = [
+            (1 if option.is_call else -1, 1 if option.is_long else -1, option.strike * 100, option.price * 100, option.quantity)
+            for option in options
+        ]
         profit_losses = []
         for price_point in price_points:
-            price_point_profit = 0.0
-            for option in self.options:
-                price_point_profit += option.get_profit_at(price_point)
-            profit_losses.append(round(price_point_profit, 2))
+            underlying_price = price_point * 100
+            profit_loss = 0
+            for call_sign, long_sign, strike, price, quantity in legs:
+                profit_loss += long_sign * (max(call_sign * (underlying_price - strike), 0) - price) * quantity
+            profit_losses.append(round(profit_loss, 2))
         max_profit_loss = max(profit_losses)
         min_profit_loss = min(profit_losses)
+        # every lot of the lowest-strike leg counts, however the fills happened to be split
+        first_option = options[0]
+        first_leg_quantity = sum(
+            option.quantity for option in options
+            if option.strike == first_option.strike and option.is_call == first_option.is_call and option.is_long == first_option.is_long
+        )
+        first_leg_value = first_option.strike * 100 * first_leg_quantity
         if max_profit_loss == profit_losses[-1] and profit_losses[-1] > profit_losses[-2]:
             self.max_profit = float('inf')
         elif max_profit_loss == profit_losses[0] and profit_losses[0] > profit_losses[1]:
-            self.max_profit = self.options[0].strike * 100
+            self.max_profit = first_leg_value
         else:
             self.max_profit = max_profit_loss
         if min_profit_loss == profit_losses[-1] and profit_losses[-1] < profit_losses[-2]:
             self.max_loss = float('inf')
         elif min_profit_loss == profit_losses[0] and profit_losses[0] < profit_losses[1]:
-            self.max_loss = self.options[0].strike * 100
+            self.max_loss = first_leg_value
         else:
             self.max_loss = abs(min_profit_loss)
 
@@ -762,11 +809,12 @@ class Strategy:
         puts_collateral = 0.0
         calls_collateral = 0.0
         for option in self.options:
+            collateral = option.get_collateral() if option.is_long else -option.get_collateral()
             if option.is_call:
-                calls_collateral += option.get_collateral() if option.is_long else -option.get_collateral()
+                calls_collateral += collateral
             else:
-                puts_collateral += option.get_collateral() if option.is_long else -option.get_collateral()
-        self.collateral = max([abs(calls_collateral), abs(puts_collateral)])
+                puts_collateral += collateral
+        self.collateral = max(abs(calls_collateral), abs(puts_collateral))
 
     @property
     def max_return_on_collateral_percent(self):
@@ -784,8 +832,8 @@ class Strategy:
             max_loss = 'inf'
         return {
             'name': self.name,
-            'max_profit': max_profit,
-            'max_loss': max_loss,
+            'maxProfit': max_profit,
+            'maxLoss': max_loss,
             'collateral': self.collateral,
             'options': [
                 option.report() for option in self.options
@@ -796,13 +844,26 @@ class Strategy:
 class Trade:
     def __init__(self, ticker: str, expiration_date: date, account: 'Account'):
         self.trade_events: List['TradeEvent'] = []
+        self._event_times: List[datetime] = []  # execution times parallel to trade_events, for bisect
+        self._events_by_key = {}  # stored as (ticker, execution_time): TradeEvent
+        self._all_options: List['Option'] = []  # every option of every event, maintained by add_event
+        self._premium = 0.0  # net premium per share of every option in _all_options, maintained by add_event
+        self._open_options: List['Option'] = []  # options still open after the last event
         # self.strategies: List['Strategy'] = []
         self.ticker: str = ticker
         self.expiration_date: date = expiration_date
+        self._expiration_date_string = expiration_date.strftime('%Y-%m-%d')
         self.account = account
         self.exercise_profit = 0.0
         self.underlying_price_at_expiration = None
         self.event_data = None
+        self._closing_time = get_expiration_close(expiration_date)
+        # only True is cached: an expired trade stays expired, and a closed one stays closed until add_event
+        self._is_expired_cache = False
+        self._is_closed_cache = False
+        self._premium_profit_by_event_cache = None
+        self._return_on_collateral_by_event_cache = None
+        self._is_win_cache = None
 
     def __repr__(self):
         return f'<Trade {self.ticker} Expiring {str(self.expiration_date)}>'
@@ -812,90 +873,78 @@ class Trade:
         if self.is_closed:
             stats = {
                 'win': self.is_win,
-                'net_profit': self.net_profit,
-                'exercise_profit': self.exercise_profit,
-                'premium_profit': self.premium_profit,
-                'premium_profit_by_trade_event': self.premium_profit_by_event,
-                'weighted_return_on_collateral_percent': self.weighted_return_on_collateral,
-                'return_on_collateral_by_event': self.return_on_collateral_by_event,
+                'netProfit': self.net_profit,
+                'exerciseProfit': self.exercise_profit,
+                'premiumProfit': self.premium_profit,
+                'premiumProfitByTradeEvent': self.premium_profit_by_event,
+                'weightedReturnOnCollateralPercent': self.weighted_return_on_collateral,
+                'returnOnCollateralByEvent': self.return_on_collateral_by_event,
                 'duration': str(self.duration),
             }
         return {
             'ticker': self.ticker,
-            'expiration_date': self.expiration_date.strftime('%Y-%m-%d'),
-            'underlying_price_at_expiration': self.underlying_price_at_expiration,
+            'expirationDate': self._expiration_date_string,
+            'underlyingPriceAtExpiration': self.underlying_price_at_expiration,
             **stats,
-            'trade_events': [
+            'tradeEvents': [
                 event.report() for event in self.trade_events
             ],
         }
 
     def resolve_events(self):
-        open_options = get_open_options(self.options)
+        open_options = self._open_options
         if open_options:
             if self.event_data is None:
                 self.event_data = ticker_event_cache.get(self.ticker)
 
-            option_ids = [option.id for option in open_options]
-            for event in self.event_data:
-                if event['option'] not in option_ids or event['state'] != 'confirmed' or event['type'] not in ('assignment', 'exercise'):
-                    continue
-                option = next((option for option in open_options if option.id == event['option']), None)
-                event_time = utc_to_eastern(event['created_at'])
-                underlying_price = float(event['underlying_price'])
-                for equity_component in event['equity_components']:
-                    price = float(equity_component['price'])
-                    is_long = True if equity_component['side'] == 'buy' else False
-                    quantity = int(float(equity_component['quantity']))
-                    self.account.add_shares([
-                        Share(self.ticker, open_price=price, open_time=event_time, is_long=is_long) for share in range(quantity)
-                    ])
-                    if is_long:
-                        self.exercise_profit += round((underlying_price - price) * quantity, 2)
-                    else:
-                        self.exercise_profit += round((price - underlying_price) * quantity, 2)
-                    # self.exercise_profit += price * quantity * (-1 if is_long else 1)
-                self.add_event(
-                    TradeEvent(
-                        ticker=self.ticker,
-                        expiration_date=self.expiration_date,
-                        execution_time=event_time,
-                        options=[
-                            Option(
-                                id_=option.id,
-                                ticker=self.ticker,
-                                expiration_date=self.expiration_date,
-                                strike=option.strike,
-                                is_call=option.is_call,
-                                is_long=not option.is_long,
-                                price=0.0,
-                            )
-                        ],
-                        end_time=event_time,
+            open_by_id = {}
+            open_quantity_by_id = {}
+            for option in open_options:
+                open_by_id.setdefault(option.id, option)
+                open_quantity_by_id[option.id] = open_quantity_by_id.get(option.id, 0) + option.quantity
+            for option_id, option in open_by_id.items():
+                remaining_quantity = open_quantity_by_id[option_id]
+                for event in self.event_data.get(option_id, ()):
+                    # an event can exercise or assign only part of the position; the rest stays open
+                    quantity = min(int(float(event['quantity'])), remaining_quantity)
+                    remaining_quantity -= quantity
+                    event_time = utc_to_eastern(event['created_at'])
+                    underlying_price = float(event['underlying_price'])
+                    for equity_component in event['equity_components']:
+                        price = float(equity_component['price'])
+                        is_long = True if equity_component['side'] == 'buy' else False
+                        share_quantity = int(float(equity_component['quantity']))
+                        self.account.add_shares([
+                            Share(self.ticker, open_price=price, open_time=event_time, is_long=is_long) for share in range(share_quantity)
+                        ])
+                        if is_long:
+                            self.exercise_profit += round((underlying_price - price) * share_quantity, 2)
+                        else:
+                            self.exercise_profit += round((price - underlying_price) * share_quantity, 2)
+                        # self.exercise_profit += price * quantity * (-1 if is_long else 1)
+                    if not quantity:
+                        continue
+                    self.add_event(
+                        TradeEvent(
+                            ticker=self.ticker,
+                            expiration_date=self.expiration_date,
+                            execution_time=event_time,
+                            options=[
+                                Option.closing_of(option, quantity=quantity)
+                            ],
+                            end_time=event_time,
+                        )
                     )
-                )
 
     def resolve_expired_options(self):
         if not self.is_expired:
             return
-        open_options = get_open_options(self.options)
-        execution_time = datetime(year=self.expiration_date.year, month=self.expiration_date.month, day=self.expiration_date.day, hour=16, minute=0, second=0, microsecond=0, tzinfo=pytz.timezone('US/Eastern'))
+        open_options = self._open_options
+        execution_time = self._closing_time
         closing_price = closing_price_cache.get((self.ticker, self.expiration_date))
         self.underlying_price_at_expiration = round(closing_price, 2)
         if self.is_expired and open_options:
-            closing_options = []
-            for option in open_options:
-                closing_options.append(
-                    Option(
-                        id_=option.id,
-                        ticker=self.ticker,
-                        expiration_date=self.expiration_date,
-                        strike=option.strike,
-                        is_call=option.is_call,
-                        is_long=not option.is_long,
-                        price=0.0,
-                    )
-                )
+            closing_options = [Option.closing_of(option) for option in open_options]
             self.add_event(
                 TradeEvent(
                     ticker=self.ticker,
@@ -903,6 +952,7 @@ class Trade:
                     execution_time=execution_time,
                     options=closing_options,
                     end_time=execution_time,
+                    pre_sorted=True,
                 )
             )
 
@@ -914,23 +964,19 @@ class Trade:
 
     @property
     def options(self) -> List['Option']:
-        ops = []
-        for event in self.trade_events:
-            ops.extend(event.options)
-        return ops
+        return self._all_options
 
     @property
     def is_closed(self) -> bool:
-        if self.is_expired or not get_open_options(self.options):
-            return True
-        return False
+        if not self._is_closed_cache:
+            self._is_closed_cache = self.is_expired or not self._open_options
+        return self._is_closed_cache
 
     @property
     def is_expired(self) -> bool:
-        closing_time = datetime(year=self.expiration_date.year, month=self.expiration_date.month, day=self.expiration_date.day, hour=16, minute=0, second=0, tzinfo=pytz.timezone('US/Eastern'))
-        if datetime.now(pytz.timezone('US/Eastern')) > closing_time:
-            return True
-        return False
+        if not self._is_expired_cache:
+            self._is_expired_cache = datetime.now(_EASTERN) > self._closing_time
+        return self._is_expired_cache
 
     @property
     def net_profit(self) -> float:
@@ -940,41 +986,45 @@ class Trade:
 
     @property
     def premium_profit(self) -> float:
-        profit = 0.0
-        for option in self.options:
-            profit += -option.price if option.is_long else option.price
-        profit *= 100
+        profit = self._premium * 100
         return round(profit, 2)
 
     @property
     def premium_profit_by_event(self) -> dict:
-        options = []
+        if self._premium_profit_by_event_cache is not None:
+            return self._premium_profit_by_event_cache
         strategy_profits = {}
+        traded_premium = 0.0
+        realized_premium = 0.0
         for event in self.trade_events:
-            # strategy_profits.setdefault(f'{strategy.name} at {strategy.trade_event.execution_time}', 0.0)
-            profit = 0.0
-            options.extend(event.options)
-            open_options = get_open_options(options)
-            closed_options = [option for option in options if option not in open_options]
-            for option in closed_options:
-                profit += -option.price if option.is_long else option.price
-                options.remove(option)
+            # premium of every contract traded so far, less what is still open, has been realized
+            for option in event.options:
+                traded_premium += (-option.price if option.is_long else option.price) * option.quantity
+            open_premium = 0.0
+            for option in event.strategy.options:
+                open_premium += (-option.price if option.is_long else option.price) * option.quantity
+            profit = traded_premium - open_premium - realized_premium
+            realized_premium += profit
             profit *= 100
-            strategy_profits[f'{event.strategy.name} at {event.execution_time}'] = round(profit, 2)
+            strategy_profits[event.strategy_key] = round(profit, 2)
+        self._premium_profit_by_event_cache = strategy_profits
         return strategy_profits
 
     @property
     def return_on_collateral_by_event(self) -> dict:
         if not self.is_closed:
             raise ValueError('Cannot get RoC of unclosed trade')
-        event_profits = list(self.premium_profit_by_event.values())
+        if self._return_on_collateral_by_event_cache is not None:
+            return self._return_on_collateral_by_event_cache
+        # each strategy's return is the profit realized by the event that follows it; the last one has none
+        next_event_profits = list(self.premium_profit_by_event.values())[1:]
+        next_event_profits.append(0.0)
         event_rocs = {}
-        for index, event in enumerate(self.trade_events):
-            try:
-                roc = event_profits[index + 1] / event.strategy.collateral * 100
-            except (IndexError, ZeroDivisionError):
-                roc = 0.0
-            event_rocs[f'{event.strategy.name} at {event.execution_time}'] = round(roc, 2)
+        for event, profit in zip(self.trade_events, next_event_profits):
+            collateral = event.strategy.collateral
+            roc = profit / collateral * 100 if collateral else 0.0
+            event_rocs[event.strategy_key] = round(roc, 2)
+        self._return_on_collateral_by_event_cache = event_rocs
         return event_rocs
 
     @property
@@ -982,21 +1032,22 @@ class Trade:
         if not self.is_closed:
             raise ValueError('Cannot get RoC of unclosed trade')
         event_rocs = self.return_on_collateral_by_event
+        trade_seconds = self.duration.total_seconds()
         rocs = []
         for event in self.trade_events:
             if event.strategy.collateral == 0.0 or event.execution_time == event.end_time:
                 continue
-            roc = event_rocs[f'{event.strategy.name} at {event.execution_time}']
-            roc *= event.duration / self.duration
+            roc = event_rocs[event.strategy_key]
+            roc *= event.duration.total_seconds() / trade_seconds
             rocs.append(roc)
-        average_roc = sum(rocs) / len(rocs)
+        average_roc = fsum(rocs) / len(rocs)
         return round(average_roc, 2)
 
     @property
     def is_win(self) -> bool:
-        if self.net_profit >= 0:
-            return True
-        return False
+        if self._is_win_cache is None:
+            self._is_win_cache = self.net_profit >= 0
+        return self._is_win_cache
 
     @property
     def duration(self) -> timedelta:
@@ -1007,28 +1058,43 @@ class Trade:
         return last_event.execution_time - first_event.execution_time
 
     def add_event(self, trade_event: 'TradeEvent'):
-        existing_event = False
-        for event in self.trade_events:
-            if event.ticker == trade_event.ticker and event.execution_time == trade_event.execution_time:
-                event.options.extend(trade_event.options)
-                existing_event = True
-                break
-        if not existing_event:
+        self._is_closed_cache = False
+        self._premium_profit_by_event_cache = None
+        self._return_on_collateral_by_event_cache = None
+        self._is_win_cache = None
+        self._all_options.extend(trade_event.options)
+        for option in trade_event.options:
+            self._premium += (-option.price if option.is_long else option.price) * option.quantity
+        event_key = (trade_event.ticker, trade_event.execution_time)
+        existing_event = self._events_by_key.get(event_key)
+        if existing_event is not None:
+            existing_event.options.extend(trade_event.options)
+            index = bisect.bisect_left(self._event_times, trade_event.execution_time)
+        else:
             trade_event.trade = self
-            self.trade_events.append(trade_event)
-            self.trade_events.sort(key=lambda event: event.execution_time)
-        # trade_event.determine_strategy()
-        options = []
-        # self.strategies = []
-        previous_event = None
-        for event in self.trade_events:
-            options.extend(event.options)
-            event.strategy = Strategy(event, get_open_options(options))
+            self._events_by_key[event_key] = trade_event
+            if not self._event_times or trade_event.execution_time >= self._event_times[-1]:
+                # events usually arrive in chronological order
+                index = len(self.trade_events)
+                self._event_times.append(trade_event.execution_time)
+                self.trade_events.append(trade_event)
+            else:
+                index = bisect.bisect_right(self._event_times, trade_event.execution_time)
+                self._event_times.insert(index, trade_event.execution_time)
+                self.trade_events.insert(index, trade_event)
+        # strategies of earlier events are unaffected, so carry on from the options left open before this one
+        previous_event = self.trade_events[index - 1] if index else None
+        options = previous_event.strategy.options if previous_event else []
+        for event in self.trade_events[index:]:
+            options = get_open_options(options + event.options)
+            event.strategy = Strategy(event, options, pre_sorted=True)
+            event.strategy_key = f'{event.strategy.name} at {event.execution_time}'
             if previous_event:
                 previous_event.end_time = event.execution_time
             if event.strategy.name == 'Close Position':
                 event.end_time = event.execution_time
             previous_event = event
+        self._open_options = options
 
 
 class TradeEvent:
@@ -1039,20 +1105,22 @@ class TradeEvent:
             expiration_date: date,
             options: List['Option'],
             end_time: datetime = None,
+            pre_sorted: bool = False,
     ):
         self.execution_time = execution_time
-        self.ticker = ticker.upper()
+        # tickers are used in dict keys for every event, so share one string object per ticker
+        self.ticker = sys.intern(ticker.upper())
         self.expiration_date = expiration_date
-        self.options = options
-        self.options = sort_options(self.options)
+        self.options = options if pre_sorted else sort_options(options)
         self.end_time = end_time
         self.strategy = None
+        self.strategy_key = None  # labels this event's strategy in per-event report stats
         self.trade = None
 
     def report(self):
         return {
-            'execution_time': self.execution_time.isoformat(),
-            'end_time': self.end_time.isoformat() if self.end_time else self.end_time,
+            'executionTime': self.execution_time.isoformat(),
+            'endTime': self.end_time.isoformat() if self.end_time else self.end_time,
             'strategy': self.strategy.report(),
             'options': [
                 option.report() for option in self.options